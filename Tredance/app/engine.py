@@ -6,10 +6,26 @@ This module contains everything needed to build and run workflow graphs:
 - Graphs: Collections of nodes connected together
 - Executor: The thing that actually runs your workflow step by step
 """
-from typing import Dict, Any, Callable, List, Optional
+from typing import Dict, Any, Callable, List, Optional, MutableMapping
 from enum import Enum
+from collections import deque, OrderedDict
+import asyncio
+import hashlib
+import inspect
+import time
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
+
+import orjson
+from cachetools import LRUCache
+
+
+# Internal tracking fields the executor (and the nodes talking to it) keep in state.
+# These never show up in the final output.
+_INTERNAL_KEYS = frozenset({
+    "_run_id", "_iteration", "_execution_log",
+    "_next_node", "_loop", "_loop_condition", "_loop_target",
+})
 
 
 class NodeStatus(Enum):
@@ -21,22 +37,34 @@ class NodeStatus(Enum):
     SKIPPED = "skipped"    # Decided not to run this one
 
 
+# The plain strings behind the statuses the executor writes. Log entries store these
+# directly, so we never have to go back through the Enum to get at .value.
+_RUNNING = NodeStatus.RUNNING.value
+_COMPLETED = NodeStatus.COMPLETED.value
+_FAILED = NodeStatus.FAILED.value
+
+
 class ExecutionLog:
     """Keeps a diary of what each node did - useful for debugging and understanding what happened!"""
     
-    def __init__(self, node_id: str, status: NodeStatus, timestamp: datetime, 
-                 message: str = "", error: Optional[str] = None):
+    # Fixed set of attributes - we make one of these per node run, so keep them small
+    __slots__ = ("node_id", "status", "timestamp", "message", "error", "clock", "record")
+    
+    def __init__(self, node_id: str, status: str, timestamp: Optional[datetime], 
+                 message: str = "", error: Optional[str] = None, clock: float = 0.0):
         self.node_id = node_id
-        self.status = status
-        self.timestamp = timestamp
+        self.status = status  # A NodeStatus value, like "running"
+        self.timestamp = timestamp  # May be filled in later from `clock` (see WorkflowExecutor._flush_log)
         self.message = message
         self.error = error
+        self.clock = clock  # When this happened, on the time.monotonic() clock
+        self.record: Optional[Dict[str, Any]] = None  # Our dict in the run's log, once published
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert our log entry into a dictionary that's easy to send over the API."""
         return {
             "node_id": self.node_id,
-            "status": self.status.value,
+            "status": self.status,
             "timestamp": self.timestamp.isoformat(),
             "message": self.message,
             "error": self.error
@@ -51,15 +79,37 @@ class Node:
     Think of it like: "Give me your data, I'll process it, and give you back improved data!"
     """
     
+    # Fixed set of attributes: smaller objects and quicker lookups for big graphs
+    __slots__ = ("node_id", "func", "description", "cacheable", "_is_async")
+    
+    # Looked up once here instead of poking at every result with hasattr()
+    _is_awaitable = staticmethod(inspect.isawaitable)
+    
     def __init__(
         self,
         node_id: str,
         func: Callable[[Dict[str, Any]], Dict[str, Any]],
-        description: str = ""
+        description: str = "",
+        cacheable: bool = False
     ):
+        """
+        The function gets the current state and returns a dict with just the keys it
+        wants to add or change - the executor merges that into the state for you.
+        Nothing to change? Return None (or an empty dict). Anything else is a mistake,
+        and the node fails with a TypeError.
+        
+        Set cacheable=True only for nodes whose output depends purely on the public
+        (non-internal) state they receive and that don't modify state in place.
+        The executor can then reuse their results when it sees the same input again.
+        Fingerprinting the input means serializing the whole state, though - so it only
+        pays off for nodes that do real work, not for quick ones.
+        """
         self.node_id = node_id  # Unique name for this node
         self.func = func        # The actual function that does the work
         self.description = description  # What this node does (for humans to read)
+        self.cacheable = cacheable  # Safe to reuse results for identical input?
+        # Figured out once, here, so running a plain function never pays for async handling
+        self._is_async = inspect.iscoroutinefunction(func)
     
     async def execute(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -69,10 +119,14 @@ class Node:
         If something goes wrong, we wrap it in a friendly error message.
         """
         try:
+            if self._is_async:
+                return await self.func(state)
+            
             result = self.func(state)
             
-            # If the function is async (returns a coroutine), we need to wait for it
-            if hasattr(result, '__await__'):
+            # Some plain callables still hand back something awaitable (a partial
+            # around an async function, an object with an async __call__...)
+            if self._is_awaitable(result):
                 result = await result
             return result
         except Exception as e:
@@ -89,19 +143,34 @@ class Graph:
     - Edges are the arrows connecting steps (do this, then do that)
     - Entry node is where you start
     - Exit nodes are where you can finish
+    
+    Parallel graphs (parallel=True) work a bit differently: every edge is followed,
+    and a node runs as soon as *all* the nodes pointing at it are done - so
+    independent branches run at the same time. Parallel graphs can't have cycles,
+    and the _next_node / _loop markers don't apply to them.
     """
     
-    def __init__(self, graph_id: str, name: str = ""):
+    # Fixed set of attributes - graphs stick around in storage, so keep them lean
+    __slots__ = ("graph_id", "name", "nodes", "edges", "entry_node", "exit_nodes",
+                 "parallel", "_indeg", "_compiled")
+    
+    def __init__(self, graph_id: str, name: str = "", parallel: bool = False):
         self.graph_id = graph_id
         self.name = name or "Unnamed Workflow"
         self.nodes: Dict[str, Node] = {}  # All the nodes in this graph
         self.edges: Dict[str, List[str]] = {}  # Which node leads to which (node_id -> [next_nodes])
         self.entry_node: Optional[str] = None  # Where do we start?
         self.exit_nodes: List[str] = []  # Where can we finish?
+        self.parallel = parallel  # Run independent branches at the same time?
+        self._indeg: Optional[Dict[str, int]] = None  # Cached by dependency_counts()
+        self._compiled: Any = None  # Cached by compile() (False means "can't be compiled")
     
-    def add_node(self, node_id: str, func: Callable, description: str = ""):
+    def add_node(self, node_id: str, func: Callable, description: str = "", cacheable: bool = False):
         """Add a new node to this graph - like adding a step to a recipe."""
-        self.nodes[node_id] = Node(node_id, func, description)
+        self.nodes[node_id] = Node(node_id, func, description, cacheable)
+        self.edges.setdefault(node_id, [])  # Ready for add_edge() - no need to check it there
+        self._indeg = None
+        self._compiled = None
         
         # If this is the first node, make it the entry point by default
         if self.entry_node is None:
@@ -122,15 +191,17 @@ class Graph:
                            f"Available nodes: {list(self.nodes.keys())}")
         
         # Add the connection
-        if from_node not in self.edges:
-            self.edges[from_node] = []
         self.edges[from_node].append(to_node)
+        self._indeg = None
+        self._compiled = None
     
     def set_entry_node(self, node_id: str):
         """Set where the workflow should start - like choosing the starting line in a race."""
         if node_id not in self.nodes:
             raise ValueError(f"Can't set entry node to '{node_id}' - that node doesn't exist!")
         self.entry_node = node_id
+        self._indeg = None
+        self._compiled = None
     
     def set_exit_nodes(self, node_ids: List[str]):
         """Set which nodes can end the workflow - like marking the finish lines."""
@@ -138,6 +209,102 @@ class Graph:
             if node_id not in self.nodes:
                 raise ValueError(f"Can't set exit node '{node_id}' - that node doesn't exist!")
         self.exit_nodes = node_ids
+    
+    def dependency_counts(self) -> Dict[str, int]:
+        """
+        For every node reachable from the entry node: how many incoming edges it waits on.
+        
+        This is what the parallel scheduler counts down. It's computed once and cached
+        until the graph changes. Raises ValueError if the graph has a cycle, because a
+        node on a cycle would wait for itself forever.
+        """
+        if self._indeg is not None:
+            return self._indeg
+        
+        # Find everything reachable from the entry node
+        reachable = set()
+        to_visit = [self.entry_node] if self.entry_node is not None else []
+        while to_visit:
+            node_id = to_visit.pop()
+            if node_id not in reachable:
+                reachable.add(node_id)
+                to_visit.extend(self.edges.get(node_id, []))
+        
+        indeg = dict.fromkeys(reachable, 0)
+        for node_id in reachable:
+            for successor in self.edges.get(node_id, []):
+                indeg[successor] += 1
+        
+        # Kahn's algorithm: if we can't peel off every node, there's a cycle
+        remaining = dict(indeg)
+        ready = [node_id for node_id, count in remaining.items() if count == 0]
+        peeled = 0
+        while ready:
+            node_id = ready.pop()
+            peeled += 1
+            for successor in self.edges.get(node_id, []):
+                remaining[successor] -= 1
+                if remaining[successor] == 0:
+                    ready.append(successor)
+        if peeled < len(indeg):
+            raise ValueError(
+                f"Parallel workflow '{self.name}' has a cycle - parallel graphs must be acyclic! "
+                f"Use a regular (non-parallel) graph if you need loops."
+            )
+        
+        self._indeg = indeg
+        return indeg
+    
+    def compile(self) -> Optional[Callable]:
+        """
+        Turn the straight-line start of this graph into one ready-made function.
+        
+        Starting at the entry node and following the first edge each time (just like
+        the executor does), we collect nodes until we hit the end or come back to a node
+        we've already got. Then we write out a function that simply runs those nodes one
+        after another - no looking up "what's next?" between steps.
+        
+        The function is only a fast path: after every node it checks whether the node
+        asked to branch or loop (_next_node / _loop), and if so it stops and tells the
+        executor where it got to, so the regular step-by-step walk can take over.
+        It returns the index of the last node it ran.
+        
+        Cached until the graph changes. Returns None for parallel graphs and graphs
+        without an entry node.
+        """
+        if self._compiled is None:
+            self._compiled = self._build_compiled() or False
+        return self._compiled or None
+    
+    def _build_compiled(self) -> Optional[Callable]:
+        """Write and compile the function behind compile()."""
+        if self.parallel or self.entry_node is None:
+            return None
+        
+        chain: List[str] = []
+        seen = set()
+        node_id = self.entry_node
+        while node_id is not None and node_id not in seen:
+            seen.add(node_id)
+            chain.append(node_id)
+            successors = self.edges.get(node_id)
+            node_id = successors[0] if successors else None
+        
+        lines = ["async def run_chain(run_node, graph, run, state):"]
+        for index in range(len(chain)):
+            lines += [
+                f"    state['_iteration'] = {index + 1}",
+                f"    await run_node(graph, node_{index}, run)",
+                f"    if '_next_node' in state or state.get('_loop', False):",
+                f"        return {index}",
+            ]
+        lines.append(f"    return {len(chain) - 1}")
+        
+        namespace: Dict[str, Any] = {f"node_{index}": self.nodes[node_id] for index, node_id in enumerate(chain)}
+        exec(compile("\n".join(lines), f"<compiled workflow {self.graph_id!r}>", "exec"), namespace)
+        run_chain = namespace["run_chain"]
+        run_chain.chain = chain  # Which nodes it runs, in order
+        return run_chain
 
 
 class WorkflowExecutor:
@@ -146,15 +313,342 @@ class WorkflowExecutor:
     
     It:
     - Keeps track of all active workflow runs
-    - Executes nodes one by one
+    - Executes nodes one by one (or side by side, for parallel graphs)
     - Manages state as it flows between nodes
     - Handles looping and branching
     - Logs everything that happens
     """
     
+    # How many cached node results we keep around (oldest ones get dropped first),
+    # how much memory they may take up all together, and the biggest single result
+    # worth keeping (bigger ones would push out lots of others)
+    MEMO_MAX_ENTRIES = 1024
+    MEMO_MAX_BYTES = 16 * 1024 * 1024
+    MEMO_MAX_RESULT_BYTES = 256 * 1024
+    
+    # How many runs we remember for GET /graph/state (least recently used ones get dropped)
+    MAX_TRACKED_RUNS = 10_000
+    
     def __init__(self):
-        # Keep track of all workflows currently running (or that have run)
-        self.active_runs: Dict[str, Dict[str, Any]] = {}
+        # Keep track of all workflows currently running (or that have run).
+        # Bounded, so a long-running server doesn't slowly fill up with old runs.
+        # A run that gets evicted mid-way still finishes - it just can't be looked up anymore.
+        self.active_runs: MutableMapping[str, Dict[str, Any]] = LRUCache(maxsize=self.MAX_TRACKED_RUNS)
+        # Results of cacheable nodes, shared across runs: input hash -> serialized result
+        self._memo: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self._memo_bytes = 0  # Size of all the serialized results in _memo
+    
+    @staticmethod
+    def _memo_key(graph: Graph, node: Node, state: Dict[str, Any]) -> Optional[bytes]:
+        """
+        Fingerprint "this node, in this graph, given this input".
+        
+        Returns None if the state can't be serialized - we just skip caching then.
+        """
+        public_state = {k: v for k, v in state.items() if k not in _INTERNAL_KEYS}
+        try:
+            payload = orjson.dumps(
+                {"g": graph.graph_id, "n": node.node_id, "s": public_state},
+                option=orjson.OPT_SORT_KEYS
+            )
+        except TypeError:
+            return None
+        return hashlib.blake2b(payload, digest_size=16).digest()
+    
+    def _remember(self, key: bytes, result: Dict[str, Any]):
+        """Cache a node's result (as JSON, so every cache hit gets its own fresh copy)."""
+        try:
+            blob = orjson.dumps(result)
+        except TypeError:
+            return
+        if len(blob) > self.MEMO_MAX_RESULT_BYTES:
+            return
+        
+        previous = self._memo.pop(key, None)
+        if previous is not None:
+            self._memo_bytes -= len(previous)
+        self._memo[key] = blob
+        self._memo_bytes += len(blob)
+        
+        # Make room: drop the least recently used results until we're within both limits
+        while len(self._memo) > self.MEMO_MAX_ENTRIES or self._memo_bytes > self.MEMO_MAX_BYTES:
+            _, dropped = self._memo.popitem(last=False)
+            self._memo_bytes -= len(dropped)
+    
+    def _flush_log(self, run: Dict[str, Any]):
+        """
+        Publish a run's pending log entries to its state["_execution_log"].
+        
+        While a node runs, all it does is drop a small event (an ExecutionLog) into
+        run["pending_log"]. The work of turning those into log records happens here,
+        off the node-to-node path: when someone asks to see the run (flush_log) and
+        once more when the run finishes.
+        """
+        log_append = run["state"]["_execution_log"].append
+        started_at, started_clock = run["started_at"], run["started_clock"]
+        for entry in run["pending_log"]:
+            # Nodes only read the cheap monotonic clock - turn that into a real
+            # date and time now, relative to when the run started
+            if entry.timestamp is None:
+                entry.timestamp = started_at + timedelta(seconds=entry.clock - started_clock)
+            # Build each dict once, then use the same object for both references
+            record = entry.record = entry.to_dict()
+            log_append(record)
+        run["pending_log"].clear()
+    
+    def flush_log(self, run_id: str):
+        """
+        Make sure a run's execution log is fully up to date.
+        
+        Log entries are only published when a run finishes - call this before showing
+        a running workflow's state to someone so they see every node that has started.
+        """
+        run = self.active_runs.get(run_id)
+        if run is not None and run["pending_log"]:
+            self._flush_log(run)
+    
+    async def _run_node(self, graph: Graph, node: Node, run: Dict[str, Any]):
+        """
+        Run a single node: log it, execute it (or reuse a cached result), and merge
+        what it returns into the state.
+        """
+        state = run["state"]
+        
+        # Log that we're starting this node (it gets published later, see _flush_log).
+        # One cheap clock read per node - the real timestamp is worked out from it later.
+        log_entry = ExecutionLog(
+            node_id=node.node_id,
+            status=_RUNNING,
+            timestamp=None,
+            message=f"Starting work on: {node.node_id}",
+            clock=time.monotonic()
+        )
+        run["pending_log"].append(log_entry)
+        
+        try:
+            # Have we already seen this exact input for this node? Then skip the work!
+            memo_key = self._memo_key(graph, node, state) if node.cacheable else None
+            cached = self._memo.get(memo_key) if memo_key is not None else None
+            
+            if cached is not None:
+                self._memo.move_to_end(memo_key)
+                result = orjson.loads(cached)
+            else:
+                # Actually run the node's function!
+                result = await node.execute(state)
+            
+            # Merge the result into our state - None or {} just means "nothing to change".
+            # (no await between here and the end, so parallel nodes never merge halfway)
+            if result is not None:
+                if not isinstance(result, dict):
+                    raise TypeError(
+                        f"Node '{node.node_id}' should return a dict of updates (or None), "
+                        f"but it returned a {type(result).__name__}!"
+                    )
+                state.update(result)
+            
+            if memo_key is not None and cached is None and result is not None:
+                self._remember(memo_key, result)
+            
+            # Mark this node as completed
+            log_entry.status = _COMPLETED
+            log_entry.message = (
+                f"Finished: {node.node_id} (from cache)" if cached is not None
+                else f"Finished: {node.node_id}"
+            )
+            record = log_entry.record
+            if record is not None:
+                # Someone flushed the log while we were running - patch our published entry
+                record["status"] = _COMPLETED
+                record["message"] = log_entry.message
+            
+        except BaseException as e:
+            # Something went wrong - log it and re-raise. (A node that gets cancelled
+            # - because another one in a parallel run failed, say - didn't finish either)
+            log_entry.status = _FAILED
+            log_entry.error = (
+                "Cancelled before it could finish" if isinstance(e, asyncio.CancelledError)
+                else str(e)
+            )
+            record = log_entry.record
+            if record is not None:
+                record["status"] = _FAILED
+                record["error"] = log_entry.error
+            raise
+    
+    async def _execute_sequential(
+        self,
+        graph: Graph,
+        run: Dict[str, Any],
+        max_iterations: int,
+        resume_after: Optional[str] = None,
+        iteration: int = 0,
+        visit_counts: Optional[Dict[str, int]] = None
+    ) -> int:
+        """
+        Walk the graph one node at a time, following edges, branches and loops.
+        
+        Normally we start at the entry node. With resume_after we instead pick up right
+        after that node has run (iteration and visit_counts say how far we already got) -
+        that's how we take over from a compiled chain (see Graph.compile()).
+        
+        Returns how many iterations it took.
+        """
+        state = run["state"]
+        
+        # Start at the entry node (or where the compiled chain left off)
+        current_node_id = graph.entry_node if resume_after is None else resume_after
+        already_ran = resume_after is not None
+        
+        # Count how often plain edges bring us back to each node (to catch accidental
+        # infinite loops). Moves a node asked for (_next_node / _loop) are deliberate, so
+        # they don't count - and they start the count over, since the node is clearly
+        # steering. Following edges alone, no node needs more visits than this.
+        if visit_counts is None:
+            visit_counts = {}
+        max_visits = max(3, len(graph.nodes))
+        nodes, edges = graph.nodes, graph.edges
+        
+        # Main execution loop - keep going until we hit an exit or max iterations
+        while current_node_id and iteration < max_iterations:
+            if already_ran:
+                already_ran = False
+            else:
+                iteration += 1
+                state["_iteration"] = iteration
+                
+                # Make sure this node actually exists
+                node = nodes.get(current_node_id)
+                if node is None:
+                    raise ValueError(
+                        f"Tried to run node '{current_node_id}' but it doesn't exist in the graph! "
+                        f"Available nodes: {list(nodes.keys())}"
+                    )
+                
+                await self._run_node(graph, node, run)
+            
+            # Now figure out which node should run next!
+            next_node_id = None
+            followed_edge = False
+            
+            # Priority 1: Check if the node explicitly told us where to go next
+            # (This enables conditional branching - "if X, go to node A, else go to node B")
+            if "_next_node" in state:
+                next_node_id = state.pop("_next_node")
+                visit_counts.clear()
+            
+            # Priority 2: Check if we're in a loop that should continue
+            elif state.get("_loop", False):
+                if state.get("_loop_condition", True):
+                    # Keep looping - go to the loop target (or stay here if no target)
+                    next_node_id = state.get("_loop_target", current_node_id)
+                    visit_counts.clear()
+                else:
+                    # Loop says we're done
+                    state.pop("_loop", None)
+            
+            # Priority 3: Follow the edges defined in the graph
+            else:
+                # For now, we take the first edge (could be extended for conditional edges)
+                successors = edges.get(current_node_id)
+                if successors:
+                    next_node_id = successors[0]
+                    followed_edge = True
+            
+            # Check if we've reached an exit node
+            # We only actually exit if there's no next node to go to
+            # (if an exit node says to continue - for looping - that's okay too)
+            if next_node_id is None and current_node_id in graph.exit_nodes:
+                # We're at an exit and have nowhere else to go - we're done!
+                break
+            
+            current_node_id = next_node_id
+            
+            # Safety check: If plain edges keep bringing us back to the same node,
+            # the graph goes round in circles with no way out - stop and say so
+            # (never hand back a half-finished run as if it had completed)
+            if followed_edge:
+                visits = visit_counts.get(current_node_id, 0) + 1
+                visit_counts[current_node_id] = visits
+                if visits > max_visits:
+                    raise RuntimeError(
+                        f"Workflow stopped: its edges lead back to node '{current_node_id}' "
+                        f"over and over ({visits} times) - this looks like an infinite loop! "
+                        f"Make sure your workflow has proper exit conditions."
+                    )
+        
+        # Check if we hit the iteration limit (probably an infinite loop protection kicked in)
+        if iteration >= max_iterations:
+            raise RuntimeError(
+                f"Workflow stopped after {max_iterations} iterations - this looks like an infinite loop! "
+                f"Make sure your workflow has proper exit conditions."
+            )
+        
+        return iteration
+    
+    async def _execute_compiled(self, graph: Graph, run_chain: Callable, run: Dict[str, Any], max_iterations: int) -> int:
+        """
+        Run a graph's compiled chain (see Graph.compile()), then let the regular walk
+        finish from wherever the chain stopped.
+        
+        Returns how many iterations it took, all together.
+        """
+        last = await run_chain(self._run_node, graph, run, run["state"])
+        chain = run_chain.chain
+        # Every node after the entry was reached along an edge exactly once - count it like the regular walk would
+        visit_counts = dict.fromkeys(chain[1:last + 1], 1)
+        return await self._execute_sequential(
+            graph, run, max_iterations,
+            resume_after=chain[last], iteration=last + 1, visit_counts=visit_counts
+        )
+    
+    async def _execute_parallel(self, graph: Graph, run: Dict[str, Any], max_iterations: int) -> int:
+        """
+        Run a parallel (acyclic) graph, starting every node as soon as all of its
+        dependencies are done - independent branches run side by side.
+        
+        Every node that runs counts as one iteration, just like in a regular run.
+        
+        Returns how many nodes ran.
+        """
+        state = run["state"]
+        
+        # Count down a fresh copy of the graph's dependency counts
+        remaining = dict(graph.dependency_counts())
+        
+        def start(node_id: str) -> asyncio.Task:
+            if state["_iteration"] >= max_iterations:
+                raise RuntimeError(
+                    f"Workflow stopped after {max_iterations} iterations - it has more nodes to run "
+                    f"than max_iterations allows!"
+                )
+            state["_iteration"] += 1
+            return asyncio.create_task(self._run_node(graph, graph.nodes[node_id], run))
+        
+        running = {start(graph.entry_node): graph.entry_node}
+        finished = 0
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node_id = running.pop(task)
+                    task.result()  # Re-raises if the node failed
+                    finished += 1
+                    
+                    # This node is done - anything that was only waiting on it can go now
+                    for successor in graph.edges.get(node_id, []):
+                        remaining[successor] -= 1
+                        if remaining[successor] == 0:
+                            running[start(successor)] = successor
+        except BaseException:
+            # One node failed (or we got cancelled) - don't leave the others running,
+            # and let them wind down so their log entries say they were cancelled
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            raise
+        
+        return finished
     
     async def execute(
         self,
@@ -188,151 +682,72 @@ class WorkflowExecutor:
         if run_id is None:
             run_id = str(uuid.uuid4())
         
-        # Start with a fresh copy of the initial state
-        # We add some internal tracking fields (prefixed with _) that won't show in final output
+        # Start with a fresh copy of the initial state - this is the only copy we make.
+        # From here on every node reads and updates this one dict in place.
+        # We add some internal tracking fields (prefixed with _) that won't show in final output.
+        # (A copy only copies references - a big code string isn't duplicated - and a plain
+        # dict keeps every state read a fast C-level lookup, unlike a ChainMap overlay.)
         state = initial_state.copy()
         state["_run_id"] = run_id
         state["_iteration"] = 0
-        state["_execution_log"] = []  # We'll add log entries here as we go
+        # Every iteration writes exactly one log entry, so this bound never drops anything
+        state["_execution_log"] = deque(maxlen=max_iterations * 2)
         
-        # Remember this run so we can check on it later via the API
-        self.active_runs[run_id] = {
+        # Remember this run so we can check on it later via the API.
+        # The record holds a reference to `state`, so it always sees the latest values -
+        # no need to re-publish the state after every node.
+        started_clock = time.monotonic()
+        run = {
             "graph_id": graph.graph_id,
             "state": state,
-            "status": "running",
-            "started_at": datetime.now()
+            "status": _RUNNING,
+            "started_at": datetime.now(),
+            "started_clock": started_clock,  # The same moment, on the time.monotonic() clock
+            "pending_log": [],  # Log entries waiting to be published (see _flush_log)
         }
+        self.active_runs[run_id] = run
         
         try:
-            # Start at the entry node
-            current_node_id = graph.entry_node
-            if current_node_id is None:
+            # Make sure we know where to start
+            if graph.entry_node is None:
                 raise ValueError(
                     "Workflow has no entry node! Please set one using set_entry_node(). "
                     "How can we start if we don't know where to begin?"
                 )
             
-            # Track which nodes we've visited (to prevent accidental infinite loops)
-            visited_nodes = set()
-            iteration = 0
+            # Straight-line stretches run through a compiled function when we can
+            # (as long as the whole chain fits within max_iterations)
+            run_chain = None if graph.parallel else graph.compile()
             
-            # Main execution loop - keep going until we hit an exit or max iterations
-            while current_node_id and iteration < max_iterations:
-                iteration += 1
-                state["_iteration"] = iteration
-                
-                # Make sure this node actually exists
-                if current_node_id not in graph.nodes:
-                    raise ValueError(
-                        f"Tried to run node '{current_node_id}' but it doesn't exist in the graph! "
-                        f"Available nodes: {list(graph.nodes.keys())}"
-                    )
-                
-                node = graph.nodes[current_node_id]
-                
-                # Log that we're starting this node
-                log_entry = ExecutionLog(
-                    node_id=current_node_id,
-                    status=NodeStatus.RUNNING,
-                    timestamp=datetime.now(),
-                    message=f"Starting work on: {current_node_id}"
-                )
-                state["_execution_log"].append(log_entry.to_dict())
-                self.active_runs[run_id]["state"] = state  # Update the stored state
-                
-                try:
-                    # Actually run the node's function!
-                    result = await node.execute(state)
-                    
-                    # Merge the result into our state
-                    if isinstance(result, dict):
-                        state.update(result)
-                    
-                    # Mark this node as completed
-                    log_entry.status = NodeStatus.COMPLETED
-                    log_entry.message = f"Finished: {current_node_id}"
-                    state["_execution_log"][-1] = log_entry.to_dict()
-                    
-                except Exception as e:
-                    # Something went wrong - log it and re-raise
-                    log_entry.status = NodeStatus.FAILED
-                    log_entry.error = str(e)
-                    state["_execution_log"][-1] = log_entry.to_dict()
-                    self.active_runs[run_id]["state"] = state
-                    raise
-                
-                # Now figure out which node should run next!
-                next_node_id = None
-                
-                # Priority 1: Check if the node explicitly told us where to go next
-                # (This enables conditional branching - "if X, go to node A, else go to node B")
-                if "_next_node" in state:
-                    next_node_id = state.pop("_next_node")
-                
-                # Priority 2: Check if we're in a loop that should continue
-                elif state.get("_loop", False):
-                    if state.get("_loop_condition", True):
-                        # Keep looping - go to the loop target (or stay here if no target)
-                        next_node_id = state.get("_loop_target", current_node_id)
-                    else:
-                        # Loop says we're done
-                        state.pop("_loop", None)
-                        next_node_id = None
-                
-                # Priority 3: Follow the edges defined in the graph
-                elif current_node_id in graph.edges:
-                    # For now, we take the first edge (could be extended for conditional edges)
-                    edges = graph.edges[current_node_id]
-                    if edges:
-                        next_node_id = edges[0]
-                
-                # Check if we've reached an exit node
-                # We only actually exit if there's no next node to go to
-                if current_node_id in graph.exit_nodes:
-                    if next_node_id is None:
-                        # We're at an exit and have nowhere else to go - we're done!
-                        break
-                    # If exit node says to continue (for looping), that's okay too
-                
-                current_node_id = next_node_id
-                
-                # Safety check: If we're visiting the same node over and over
-                # and we're not explicitly in a loop, something might be wrong
-                if current_node_id and current_node_id in visited_nodes and not state.get("_loop", False):
-                    # Give it some wiggle room (2x the number of nodes) before we panic
-                    if len(visited_nodes) > len(graph.nodes) * 2:
-                        break
-                
-                if current_node_id:
-                    visited_nodes.add(current_node_id)
-            
-            # Check if we hit the iteration limit (probably an infinite loop protection kicked in)
-            if iteration >= max_iterations:
-                raise RuntimeError(
-                    f"Workflow stopped after {max_iterations} iterations - this looks like an infinite loop! "
-                    f"Make sure your workflow has proper exit conditions."
-                )
+            if graph.parallel:
+                iteration = await self._execute_parallel(graph, run, max_iterations)
+            elif run_chain is not None and len(run_chain.chain) < max_iterations:
+                iteration = await self._execute_compiled(graph, run_chain, run, max_iterations)
+            else:
+                iteration = await self._execute_sequential(graph, run, max_iterations)
+            self._flush_log(run)
             
-            # Clean up: Remove internal tracking fields (ones starting with _) from final output
-            final_state = {k: v for k, v in state.items() if not k.startswith("_")}
+            # Clean up: Remove internal tracking fields from final output
+            final_state = {k: v for k, v in state.items() if k not in _INTERNAL_KEYS}
             
             # Mark this run as completed
-            self.active_runs[run_id]["status"] = "completed"
-            self.active_runs[run_id]["completed_at"] = datetime.now()
-            self.active_runs[run_id]["final_state"] = final_state
+            run["status"] = "completed"
+            run["completed_at"] = datetime.now()
+            run["final_state"] = final_state
             
             return {
                 "run_id": run_id,
                 "final_state": final_state,
-                "execution_log": state["_execution_log"],
+                "execution_log": list(state["_execution_log"]),
                 "iterations": iteration
             }
             
         except Exception as e:
             # If anything went wrong, mark the run as failed
-            self.active_runs[run_id]["status"] = "failed"
-            self.active_runs[run_id]["error"] = str(e)
-            self.active_runs[run_id]["completed_at"] = datetime.now()
+            self._flush_log(run)
+            run["status"] = "failed"
+            run["error"] = str(e)
+            run["completed_at"] = datetime.now()
             raise
         finally:
             # We keep the run data in active_runs so the API can still query it
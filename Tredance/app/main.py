@@ -5,16 +5,34 @@ This is where all the HTTP endpoints live. Think of it as the reception desk
 for our workflow system - it takes requests, routes them to the right place,
 and sends back helpful responses.
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Dict, Any, List, Optional
+from pydantic import BaseModel, Field, SkipValidation, TypeAdapter, field_validator
+from pydantic_core import PydanticCustomError
+from typing import Dict, Any, List, Optional, MutableMapping
+from contextlib import asynccontextmanager
+from collections import deque
+import asyncio
 import uuid
 from datetime import datetime
 
+import orjson
+from cachetools import LRUCache
+
 from app.engine import Graph, WorkflowExecutor
 from app.workflows import create_code_review_workflow
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Everything that needs to happen when the server starts up (and shuts down)."""
+    # On Python 3.12+, let new tasks start running right away instead of waiting for
+    # the next event-loop turn. Tasks that finish without ever suspending (most of
+    # our nodes!) then never touch the scheduler at all.
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    yield
+
+
 # Create the FastAPI app with friendly metadata
 app = FastAPI(
     title="Workflow Graph Engine API",
@@ -28,7 +46,8 @@ app = FastAPI(
     contact={
         "name": "Workflow Engine Help",
         "email": "help@workflow-engine.example.com"
-    }
+    },
+    lifespan=lifespan
 )
 
 # Enable CORS so your frontend can talk to this API
@@ -45,8 +64,15 @@ app.add_middleware(
 # Global Storage
 # ============================================================================
 
+# How many workflow graphs we hold on to (the least recently used ones get dropped first)
+MAX_STORED_GRAPHS = 1_000
+
 # Where we keep all the workflow graphs people create
-graphs_storage: Dict[str, Graph] = {}
+graphs_storage: MutableMapping[str, Graph] = LRUCache(maxsize=MAX_STORED_GRAPHS)
+
+# The workflows that come with the server. They live apart from graphs_storage, so
+# they're always there - no matter how many graphs people create.
+builtin_graphs: Dict[str, Graph] = {}
 
 # The executor that runs workflows (one instance handles all runs)
 executor = WorkflowExecutor()
@@ -75,6 +101,7 @@ class CreateGraphRequest(BaseModel):
     edges: List[EdgeDefinition]  # How the nodes connect together
     entry_node: Optional[str] = None  # Where to start (we'll pick the first node if you don't)
     exit_nodes: List[str] = []  # Where you can finish (optional)
+    parallel: bool = False  # Run independent branches at the same time? (no cycles allowed)
 
 
 class CreateGraphResponse(BaseModel):
@@ -86,8 +113,18 @@ class CreateGraphResponse(BaseModel):
 class RunGraphRequest(BaseModel):
     """What you send us when you want to run a workflow."""
     graph_id: str  # Which workflow do you want to run?
-    initial_state: Dict[str, Any]  # Starting data for the workflow
-    max_iterations: int = 1000  # Safety limit (prevents infinite loops)
+    # Starting data for the workflow. It's handed to the engine as-is, so we skip
+    # Pydantic's key-by-key rebuild of it (we still check it's a dict - see below)
+    initial_state: SkipValidation[Dict[str, Any]]
+    max_iterations: int = Field(1000, ge=1)  # Safety limit (prevents infinite loops)
+    
+    @field_validator("initial_state")
+    @classmethod
+    def _initial_state_is_a_dict(cls, value: Any) -> Dict[str, Any]:
+        """Make sure initial_state is a JSON object - with the same error Pydantic would give."""
+        if not isinstance(value, dict):
+            raise PydanticCustomError("dict_type", "Input should be a valid dictionary")
+        return value
 
 
 class RunGraphResponse(BaseModel):
@@ -98,6 +135,10 @@ class RunGraphResponse(BaseModel):
     iterations: int  # How many iterations we did
 
 
+# Serializes run results straight to JSON bytes (see run_response below)
+_RUN_GRAPH_RESPONSE = TypeAdapter(RunGraphResponse)
+
+
 class StateResponse(BaseModel):
     """What you get when you check on a running workflow."""
     run_id: str
@@ -113,6 +154,24 @@ class StateResponse(BaseModel):
 # Helper Functions
 # ============================================================================
 
+def _json_default(value: Any) -> Any:
+    """Teach orjson about the non-JSON containers that can show up in workflow state."""
+    if isinstance(value, (deque, set, frozenset)):
+        return list(value)
+    raise TypeError(f"Can't turn {type(value).__name__} into JSON")
+
+
+def run_response(result: Dict[str, Any]) -> Response:
+    """
+    Turn an executor result into a RunGraphResponse-shaped JSON response.
+    
+    The executor already gives us exactly the right fields, so instead of validating
+    everything again we just assemble the model and dump it to JSON in one go.
+    """
+    body = _RUN_GRAPH_RESPONSE.dump_json(RunGraphResponse.model_construct(**result))
+    return Response(content=body, media_type="application/json")
+
+
 def create_node_function(node_id: str, description: str):
     """
     Create a simple default function for a node.
@@ -130,6 +189,50 @@ def create_node_function(node_id: str, description: str):
     return node_func
 
 
+def build_code_review_graph() -> Graph:
+    """
+    Build the Code Review workflow graph from its definition.
+    
+    The graph never changes, so we only do this once when the server starts.
+    """
+    workflow_def = create_code_review_workflow()
+    graph = Graph("code_review_workflow", workflow_def["name"])
+    
+    # Add all the nodes
+    for node_id, node_data in workflow_def["nodes"].items():
+        graph.add_node(
+            node_id, node_data["func"], node_data["description"],
+            cacheable=node_data.get("cacheable", False)
+        )
+    
+    # Connect them with edges
+    for from_node, to_node in workflow_def["edges"]:
+        graph.add_edge(from_node, to_node)
+    
+    graph.set_entry_node(workflow_def["entry_node"])
+    graph.set_exit_nodes(workflow_def["exit_nodes"])
+    return graph
+
+
+def find_graph(graph_id: str) -> Optional[Graph]:
+    """Look up a graph by ID - the built-in ones first, then the ones people created."""
+    graph = builtin_graphs.get(graph_id)
+    if graph is None:
+        graph = graphs_storage.get(graph_id)
+    return graph
+
+
+def all_graphs() -> Dict[str, Graph]:
+    """Every graph we can run right now: the built-in ones, then the ones people created."""
+    return {**builtin_graphs, **graphs_storage}
+
+
+# The Code Review workflow is built once and shared by every request.
+# It's a built-in graph too, so you can run it through POST /graph/run as well!
+CODE_REVIEW_GRAPH = build_code_review_graph()
+builtin_graphs[CODE_REVIEW_GRAPH.graph_id] = CODE_REVIEW_GRAPH
+
+
 # ============================================================================
 # API Endpoints
 # ============================================================================
@@ -181,13 +284,14 @@ async def create_graph(request: CreateGraphRequest):
     """
     # Generate a unique ID for this graph
     graph_id = str(uuid.uuid4())
-    graph = Graph(graph_id, request.name or "Unnamed Workflow")
+    graph = Graph(graph_id, request.name or "Unnamed Workflow", parallel=request.parallel)
     
     # Add all the nodes
     for node_def in request.nodes:
         # For now, nodes get default functions
         # In production, you'd want to allow custom functions or tool references!
         node_func = create_node_function(node_def.node_id, node_def.description)
+        # (Not cacheable: they're so cheap that fingerprinting the state would cost more)
         graph.add_node(node_def.node_id, node_func, node_def.description)
     
     # Connect the nodes with edges
@@ -214,6 +318,13 @@ async def create_graph(request: CreateGraphRequest):
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
     
+    # Parallel graphs can't loop - better to find out now than halfway through a run
+    if graph.parallel:
+        try:
+            graph.dependency_counts()
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
     # Save the graph so it can be run later
     graphs_storage[graph_id] = graph
     
@@ -233,18 +344,17 @@ async def run_graph(request: RunGraphRequest):
     that happened.
     """
     # Make sure the graph exists
-    if request.graph_id not in graphs_storage:
+    graph = find_graph(request.graph_id)
+    if graph is None:
         raise HTTPException(
             status_code=404,
             detail=(
                 f"Workflow '{request.graph_id}' not found! "
                 f"Make sure you created it first using POST /graph/create. "
-                f"Available workflows: {list(graphs_storage.keys())}"
+                f"Available workflows: {list(all_graphs().keys())}"
             )
         )
     
-    graph = graphs_storage[request.graph_id]
-    
     try:
         # Run the workflow!
         result = await executor.execute(
@@ -252,7 +362,7 @@ async def run_graph(request: RunGraphRequest):
             request.initial_state,
             max_iterations=request.max_iterations
         )
-        return RunGraphResponse(**result)
+        return run_response(result)
     except ValueError as e:
         # User error (like missing entry node) - 400 Bad Request
         raise HTTPException(status_code=400, detail=str(e))
@@ -275,7 +385,8 @@ async def get_graph_state(run_id: str):
     - What's the current state?
     - Did it finish? Did it fail?
     """
-    if run_id not in executor.active_runs:
+    run_data = executor.active_runs.get(run_id)
+    if run_data is None:
         raise HTTPException(
             status_code=404,
             detail=(
@@ -285,17 +396,26 @@ async def get_graph_state(run_id: str):
             )
         )
     
-    run_data = executor.active_runs[run_id]
+    executor.flush_log(run_id)  # Show every node that has started so far
     
-    return StateResponse(
-        run_id=run_id,
-        graph_id=run_data["graph_id"],
-        status=run_data["status"],
-        state=run_data.get("state", {}),
-        started_at=run_data.get("started_at").isoformat() if run_data.get("started_at") else None,
-        completed_at=run_data.get("completed_at").isoformat() if run_data.get("completed_at") else None,
-        error=run_data.get("error")
-    )
+    # The state can be big (all that code!), so we serialize it straight to JSON
+    # with orjson instead of copying it into a StateResponse first.
+    # (orjson turns down a few things Pydantic can handle - like integers wider than
+    # 64 bits - and for those we go the regular StateResponse way instead)
+    content = {
+        "run_id": run_id,
+        "graph_id": run_data["graph_id"],
+        "status": run_data["status"],
+        "state": run_data.get("state", {}),
+        "started_at": run_data.get("started_at").isoformat() if run_data.get("started_at") else None,
+        "completed_at": run_data.get("completed_at").isoformat() if run_data.get("completed_at") else None,
+        "error": run_data.get("error")
+    }
+    try:
+        body = orjson.dumps(content, default=_json_default)
+    except orjson.JSONEncodeError:
+        return StateResponse(**content)
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/graph/list")
@@ -306,14 +426,15 @@ async def list_graphs():
     Get a list of all workflows with their details - useful for browsing
     what you have available.
     """
-    if not graphs_storage:
+    graphs = all_graphs()
+    if not graphs:
         return {
             "message": "You haven't created any workflows yet! Use POST /graph/create to get started.",
             "graphs": []
         }
     
     return {
-        "message": f"Found {len(graphs_storage)} workflow(s)!",
+        "message": f"Found {len(graphs)} workflow(s)!",
         "graphs": [
             {
                 "graph_id": graph_id,
@@ -322,7 +443,7 @@ async def list_graphs():
                 "edge_count": sum(len(edges) for edges in graph.edges.values()),
                 "description": f"{graph.name} with {len(graph.nodes)} nodes"
             }
-            for graph_id, graph in graphs_storage.items()
+            for graph_id, graph in graphs.items()
         ]
     }
 
@@ -366,24 +487,6 @@ async def run_code_review_workflow(request: Dict[str, Any]):
     
     We'll analyze it and give you detailed feedback!
     """
-    # Get the workflow definition
-    workflow_def = create_code_review_workflow()
-    
-    # Build the graph from the definition
-    graph_id = "code_review_workflow"
-    graph = Graph(graph_id, workflow_def["name"])
-    
-    # Add all the nodes
-    for node_id, node_data in workflow_def["nodes"].items():
-        graph.add_node(node_id, node_data["func"], node_data["description"])
-    
-    # Connect them with edges
-    for from_node, to_node in workflow_def["edges"]:
-        graph.add_edge(from_node, to_node)
-    
-    graph.set_entry_node(workflow_def["entry_node"])
-    graph.set_exit_nodes(workflow_def["exit_nodes"])
-    
     # Prepare the initial state from the request
     code = request.get("code", "")
     if not code:
@@ -400,8 +503,8 @@ async def run_code_review_workflow(request: Dict[str, Any]):
     
     # Run it!
     try:
-        result = await executor.execute(graph, initial_state)
-        return RunGraphResponse(**result)
+        result = await executor.execute(CODE_REVIEW_GRAPH, initial_state)
+        return run_response(result)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -10,8 +10,10 @@ Nodes can grab tools from here to do things like:
 
 Want to add your own tool? Just write a function and register it!
 """
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, Iterator, Optional, Tuple
+import ast
 import re
+import warnings
 
 
 class ToolRegistry:
@@ -27,21 +29,24 @@ class ToolRegistry:
     
     def __init__(self):
         self.tools: Dict[str, Callable] = {}
+        self._list_cache: Optional[Dict[str, str]] = None  # Built by list_tools(), reset by register()
     
     def register(self, name: str, func: Callable):
         """Add a new tool to the registry - give it a name so others can find it!"""
         self.tools[name] = func
+        self._list_cache = None
     
     def get(self, name: str) -> Callable:
         """Find a tool by name - throws a helpful error if it doesn't exist."""
-        if name not in self.tools:
+        try:
+            return self.tools[name]
+        except KeyError:
             available = ", ".join(self.tools.keys()) or "none"
             raise ValueError(
                 f"Tool '{name}' not found! "
                 f"Available tools: {available}. "
                 f"Did you forget to register it?"
-            )
-        return self.tools[name]
+            ) from None
     
     def call(self, name: str, *args, **kwargs) -> Any:
         """Use a tool by name - just pass in the tool name and its arguments."""
@@ -53,11 +58,15 @@ class ToolRegistry:
         Get a list of all available tools with their descriptions.
         
         Perfect for showing users what they can use in their workflows!
+        The list is built once and reused until a new tool is registered - so please
+        treat it as read-only.
         """
-        return {
-            name: func.__doc__ or "No description available"
-            for name, func in self.tools.items()
-        }
+        if self._list_cache is None:
+            self._list_cache = {
+                name: func.__doc__ or "No description available"
+                for name, func in self.tools.items()
+            }
+        return self._list_cache
 
 
 # Create a global tool registry that everyone can use
@@ -68,6 +77,153 @@ tool_registry = ToolRegistry()
 # Code Analysis Tools
 # ============================================================================
 
+# The patterns our tools look for - compiled once here instead of on every call
+_DIGIT_RUN_RE = re.compile(r'\d\d\d+')  # Runs of 3+ digits (candidate magic numbers)
+_TODO_RE = re.compile(r'(TODO|FIXME|XXX|HACK)', re.IGNORECASE)  # Technical debt markers
+_TODO_MARKERS = ('todo', 'fixme', 'xxx', 'hack')  # The same markers, for plain counting
+_FUNC_HEAD_RE = re.compile(r'def\s+(\w+)\s*\(')  # The "def function_name(" part of a definition
+
+
+# The blocks that push code one level deeper
+_NESTING_NODES: Tuple[type, ...] = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.Try) + (
+    (ast.TryStar,) if hasattr(ast, "TryStar") else ()  # try/except* (Python 3.11+)
+)
+
+# Where a statement keeps the statements inside it (try's except blocks and match's
+# cases hold their own body). Only statements can contain other statements, so this
+# is all we need to walk - no need to look inside every single expression.
+_BLOCK_FIELDS = ("body", "orelse", "handlers", "finalbody", "cases")
+
+# A line that starts a nested block, for when the code doesn't parse (see _indent_nesting)
+_BLOCK_START_RE = re.compile(r'(?:async\s+)?(?:if|elif|else|for|while|try|except|finally)\b')
+
+
+def _max_nesting(code: str) -> Optional[int]:
+    """
+    How deeply are the if/for/while/try blocks nested inside each other?
+    
+    We let Python itself parse the code and walk the real structure, so keywords in
+    strings or comments don't fool us, and an if/elif/elif chain counts as one level
+    (elif is stored as an `if` inside the previous one's else - we can tell it apart
+    because it starts in the same column as the `if` it continues).
+    
+    Returns None if the code doesn't parse (a half-written snippet, say).
+    """
+    try:
+        # Odd bits of code (like "12and x" or "\d" in a string) make the parser warn -
+        # that's for the code's author, not for our server's log
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            tree = ast.parse(code)
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        return None
+    
+    deepest = 0
+    # (statement, how many nesting blocks are around it) - a list instead of recursion,
+    # so deeply nested code can't hit Python's recursion limit
+    to_visit = [(statement, 0) for statement in tree.body]
+    while to_visit:
+        node, depth = to_visit.pop()
+        inner = depth
+        if isinstance(node, _NESTING_NODES):
+            inner = depth + 1
+            if inner > deepest:
+                deepest = inner
+        
+        elif_node = None
+        if isinstance(node, ast.If) and len(node.orelse) == 1:
+            orelse = node.orelse[0]
+            if isinstance(orelse, ast.If) and orelse.col_offset == node.col_offset:
+                elif_node = orelse
+        
+        for field in _BLOCK_FIELDS:
+            for child in getattr(node, field, ()):
+                to_visit.append((child, depth if child is elif_node else inner))
+    
+    return deepest
+
+
+def _indent_nesting(code: str) -> int:
+    """
+    Guess how deeply the if/for/while/try blocks are nested from the indentation alone.
+    
+    For code that doesn't parse: we keep a stack of the lines that enclose the current
+    one (the ones less indented than it), and every block-starting line adds a level
+    for what's indented under it. elif/else/except/finally sit at their `if`'s (or
+    `try`'s) indentation, so they end up on the same level - just like the real thing.
+    """
+    deepest = 0
+    enclosing = []  # (indentation, nesting depth of the lines indented under it)
+    for line in code.split('\n'):
+        stripped = line.lstrip()
+        if not stripped or stripped[0] == '#':
+            continue
+        indent = len(line.expandtabs()) - len(line.expandtabs().lstrip())
+        while enclosing and enclosing[-1][0] >= indent:
+            enclosing.pop()
+        depth = enclosing[-1][1] if enclosing else 0
+        if _BLOCK_START_RE.match(stripped):
+            depth += 1
+            if depth > deepest:
+                deepest = depth
+        enclosing.append((indent, depth))
+    return deepest
+
+
+def _count_magic_numbers(code: str) -> int:
+    """
+    Count the numbers with 3+ digits that stand on their own, like 1000 in "x = 1000".
+    
+    A regex with word boundaries has to test every single position, which is slow.
+    Instead we let the regex find just the digit runs - there are usually only a few -
+    and check the characters on either side ourselves: a run glued to a letter, digit
+    or underscore (like "x1000" or "1000px") isn't a standalone number.
+    """
+    count = 0
+    end_of_code = len(code)
+    for match in _DIGIT_RUN_RE.finditer(code):
+        start, end = match.span()
+        if start:
+            before = code[start - 1]
+            if before.isalnum() or before == '_':
+                continue
+        if end < end_of_code:
+            after = code[end]
+            if after.isalnum() or after == '_':
+                continue
+        count += 1
+    return count
+
+
+def _function_defs(code: str, pos: int = 0) -> Iterator[Tuple[str, int, int]]:
+    """
+    Find function definitions - "def function_name(...):" - from `pos` onwards.
+    
+    Yields (name, start, end) for each one, exactly like
+    re.finditer(r'def\\s+(\\w+)\\s*\\([^)]*\\):', code, pos) would. We just don't
+    let the regex do the "(...):" part: for text full of "def x(" with no closing ")",
+    it would scan all the way to the end again for every single one (slow - and an easy
+    way for a big request to tie up the server). A definition's arguments always run to
+    the first ")" after its "(", so we find that with str.find and reuse it for every
+    "def" that shares it.
+    """
+    close = -1  # The first ")" at or after the last "(" we looked at
+    while True:
+        head = _FUNC_HEAD_RE.search(code, pos)
+        if head is None:
+            return
+        args_start = head.end()
+        if close < args_start:
+            close = code.find(')', args_start)
+            if close == -1:
+                return  # No ")" anywhere after this - so no more definitions either
+        if code.startswith(':', close + 1):
+            yield head.group(1), head.start(), close + 2
+            pos = close + 2
+        else:
+            pos = head.start() + 1
+
+
 def detect_smells(code: str) -> Dict[str, Any]:
     """
     Sniff out code smells - those telltale signs that code could be better!
@@ -89,24 +245,22 @@ def detect_smells(code: str) -> Dict[str, Any]:
     issues = []
     
     # Check for functions that are too long (harder to read and maintain)
-    lines = code.split('\n')
-    if len(lines) > 50:
+    # (counting newlines gives us the line count without building a list of lines)
+    line_count = code.count('\n') + 1
+    if line_count > 50:
         issues.append({
             "type": "long_function",
             "severity": "medium",
-            "message": f"This function is {len(lines)} lines long. "
+            "message": f"This function is {line_count} lines long. "
                       f"Consider splitting it into smaller, focused functions. "
                       f"Your future self will thank you!"
         })
     
     # Check for code that's nested too deeply (hard to follow the logic)
-    max_nesting = 0
-    current_nesting = 0
-    for line in lines:
-        # Count control flow statements that add nesting
-        current_nesting += line.count('if ') + line.count('for ') + line.count('while ')
-        current_nesting -= line.count('elif ') - 1  # elif doesn't add new nesting level
-        max_nesting = max(max_nesting, current_nesting)
+    max_nesting = _max_nesting(code)
+    if max_nesting is None:
+        # Not valid Python - make our best guess from the indentation instead
+        max_nesting = _indent_nesting(code)
     
     if max_nesting > 4:
         issues.append({
@@ -118,18 +272,25 @@ def detect_smells(code: str) -> Dict[str, Any]:
         })
     
     # Check for "magic numbers" - hardcoded numbers that don't explain themselves
-    magic_numbers = re.findall(r'\b\d{3,}\b', code)  # Find numbers with 3+ digits
-    if len(magic_numbers) > 5:
+    magic_count = _count_magic_numbers(code)  # Find numbers with 3+ digits
+    if magic_count > 5:
         issues.append({
             "type": "magic_numbers",
             "severity": "low",
-            "message": f"Found {len(magic_numbers)} potential magic numbers. "
+            "message": f"Found {magic_count} potential magic numbers. "
                       f"Consider replacing them with named constants so the code explains itself. "
                       f"For example: MAX_RETRIES = 3 instead of just 3"
         })
     
     # Check for TODO/FIXME comments (technical debt markers)
-    todo_count = len(re.findall(r'(TODO|FIXME|XXX|HACK)', code, re.IGNORECASE))
+    # For plain ASCII code, lowercasing once and counting each marker is a lot quicker
+    # than the case-insensitive regex - and gives the same answer, since no two markers
+    # can overlap. Anything else goes through the regex, which knows the unicode case rules.
+    if code.isascii():
+        lowered = code.lower()
+        todo_count = sum(lowered.count(marker) for marker in _TODO_MARKERS)
+    else:
+        todo_count = len(_TODO_RE.findall(code))
     if todo_count > 0:
         issues.append({
             "type": "todo_comments",
@@ -145,6 +306,23 @@ def detect_smells(code: str) -> Dict[str, Any]:
     }
 
 
+def _quality_score(complexity: int) -> int:
+    """
+    Turn a complexity count into a quality score (0-100).
+    
+    More complexity = lower quality score: every decision point costs 2 points.
+    This is a simple formula - in real life, you'd use more sophisticated metrics.
+    """
+    # Complexity always starts at 1, so the score can never go above 100 -
+    # we only need to stop it from dropping below 0
+    return 100 - complexity * 2 if complexity < 50 else 0
+
+
+# The words that add a decision point to the code (see check_complexity) - whole words
+# only, so the "or" in "for" or the "if" in "elif" and "diff" don't count as extras
+_COMPLEXITY_RE = re.compile(r'\b(?:if|elif|else|for|while|except|and|or)\b')
+
+
 def check_complexity(code: str) -> Dict[str, Any]:
     """
     Measure how complex your code is - like a readability score!
@@ -166,23 +344,19 @@ def check_complexity(code: str) -> Dict[str, Any]:
         - quality_score: A score from 0-100 (higher is better!)
     """
     lines = code.split('\n')
-    non_empty_lines = [line for line in lines if line.strip()]
+    non_empty_lines = sum(map(bool, map(str.strip, lines)))
     
     # Simple cyclomatic complexity: count decision points
-    # Each if/for/while/etc. makes the code harder to follow
-    complexity_keywords = ['if', 'elif', 'else', 'for', 'while', 'except', 'and', 'or']
-    complexity = 1  # Start with base complexity of 1
-    for line in lines:
-        complexity += sum(1 for keyword in complexity_keywords if keyword in line)
+    # Each if/for/while/etc. makes the code harder to follow - so every one of them
+    # adds a point (on top of the base complexity of 1)
+    complexity = 1 + len(_COMPLEXITY_RE.findall(code))
     
     # Convert complexity to a quality score (0-100)
-    # More complexity = lower quality score
-    # This is a simple formula - in real life, you'd use more sophisticated metrics
-    quality_score = max(0, min(100, 100 - (complexity * 2)))
+    quality_score = _quality_score(complexity)
     
     return {
         "complexity": complexity,
-        "lines_of_code": len(non_empty_lines),
+        "lines_of_code": non_empty_lines,
         "total_lines": len(lines),
         "quality_score": quality_score
     }
@@ -203,24 +377,29 @@ def extract_functions(code: str) -> Dict[str, Any]:
         - function_count: How many functions we found
     """
     functions = []
-    # Look for function definitions: "def function_name(...):"
-    function_pattern = re.compile(r'def\s+(\w+)\s*\([^)]*\):')
     
-    for match in function_pattern.finditer(code):
-        func_name = match.group(1)  # Extract the function name
-        start_pos = match.start()
+    # Look for function definitions: "def function_name(...):" - all in one pass
+    matches = list(_function_defs(code))
+    
+    for index, (func_name, start_pos, match_end) in enumerate(matches):
         
-        # Find where this function ends (simplified - looks for next function or end of string)
-        end_match = function_pattern.search(code, start_pos + 1)
-        if end_match:
-            func_code = code[start_pos:end_match.start()]
+        # Find where this function ends (simplified - looks for next function or end of string).
+        # Usually that's simply where the next match starts. Only if another "def" hides
+        # inside this very match (say, in a default argument) could a function start in
+        # the middle of it - then we search for it.
+        if code.find('def', start_pos + 1, match_end) != -1:
+            end_match = next(_function_defs(code, start_pos + 1), None)
+            end_pos = end_match[1] if end_match else len(code)
+        elif index + 1 < len(matches):
+            end_pos = matches[index + 1][1]
         else:
-            func_code = code[start_pos:]
+            end_pos = len(code)
+        func_code = code[start_pos:end_pos]
         
         functions.append({
             "name": func_name,
             "code": func_code.strip(),
-            "line_count": len(func_code.split('\n'))
+            "line_count": code.count('\n', start_pos, end_pos) + 1
         })
     
     return {
@@ -229,6 +408,55 @@ def extract_functions(code: str) -> Dict[str, Any]:
     }
 
 
+def analyze_code(code: str) -> Dict[str, Any]:
+    """
+    Run all of our code analysis tools at once - the full check-up in one call!
+    
+    Handy when a workflow needs everything about the same code anyway: ask once,
+    then just pick out the parts you need.
+    
+    Args:
+        code: The source code to analyze
+        
+    Returns:
+        Everything extract_functions, check_complexity and detect_smells return, together:
+        functions, function_count, complexity, lines_of_code, total_lines,
+        quality_score, issues and issue_count
+    """
+    return {
+        **extract_functions(code),
+        **check_complexity(code),
+        **detect_smells(code)
+    }
+
+
+# What we suggest for each kind of issue detect_smells finds - one quick lookup per issue
+_SUGGESTION_TEMPLATES: Dict[str, Dict[str, str]] = {
+    "long_function": {
+        "type": "refactor",
+        "priority": "medium",
+        "suggestion": "This function is doing too much! "
+                     "Try splitting it into smaller functions, each doing one thing well. "
+                     "Think: 'Can I explain what this function does in one sentence?'"
+    },
+    "high_nesting": {
+        "type": "refactor",
+        "priority": "high",
+        "suggestion": "Those nested if statements are hard to follow! "
+                     "Consider: extracting helper functions, using early returns, "
+                     "or restructuring with guard clauses. "
+                     "Your brain will thank you when debugging later!"
+    },
+    "magic_numbers": {
+        "type": "refactor",
+        "priority": "low",
+        "suggestion": "Replace those mysterious numbers with named constants! "
+                     "Instead of `if count > 42:`, use `MAX_ITEMS = 42` then `if count > MAX_ITEMS:`. "
+                     "Your code will explain itself better."
+    },
+}
+
+
 def suggest_improvements(issues: list, complexity: int, quality_score: float) -> Dict[str, Any]:
     """
     Give friendly, actionable advice on how to improve your code!
@@ -249,32 +477,11 @@ def suggest_improvements(issues: list, complexity: int, quality_score: float) ->
     suggestions = []
     
     # Give suggestions based on the issues we found
+    # (each gets its own copy, so changing one suggestion never touches the templates)
     for issue in issues:
-        if issue["type"] == "long_function":
-            suggestions.append({
-                "type": "refactor",
-                "priority": "medium",
-                "suggestion": "This function is doing too much! "
-                             "Try splitting it into smaller functions, each doing one thing well. "
-                             "Think: 'Can I explain what this function does in one sentence?'"
-            })
-        elif issue["type"] == "high_nesting":
-            suggestions.append({
-                "type": "refactor",
-                "priority": "high",
-                "suggestion": "Those nested if statements are hard to follow! "
-                             "Consider: extracting helper functions, using early returns, "
-                             "or restructuring with guard clauses. "
-                             "Your brain will thank you when debugging later!"
-            })
-        elif issue["type"] == "magic_numbers":
-            suggestions.append({
-                "type": "refactor",
-                "priority": "low",
-                "suggestion": "Replace those mysterious numbers with named constants! "
-                             "Instead of `if count > 42:`, use `MAX_ITEMS = 42` then `if count > MAX_ITEMS:`. "
-                             "Your code will explain itself better."
-            })
+        template = _SUGGESTION_TEMPLATES.get(issue["type"])
+        if template is not None:
+            suggestions.append(dict(template))
     
     # Give suggestions based on overall complexity
     if complexity > 20:
@@ -312,3 +519,4 @@ tool_registry.register("detect_smells", detect_smells)
 tool_registry.register("check_complexity", check_complexity)
 tool_registry.register("extract_functions", extract_functions)
 tool_registry.register("suggest_improvements", suggest_improvements)
+tool_registry.register("analyze_code", analyze_code)
@@ -1,17 +1,27 @@
 """
 Example usage of the Workflow Graph Engine API.
 """
-import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
 
 BASE_URL = "http://localhost:8000"
 
+# One session for every call, so they all reuse their connections to the server.
+# The examples below run side by side, so we keep a few connections around.
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_maxsize=2))
+
 
-def example_code_review():
-    """Example: Run the Code Review workflow."""
-    print("=" * 60)
-    print("Example: Code Review Workflow")
-    print("=" * 60)
+def example_code_review() -> str:
+    """Example: Run the Code Review workflow. Returns the text to show."""
+    lines = [
+        "=" * 60,
+        "Example: Code Review Workflow",
+        "=" * 60,
+    ]
     
     code = """
 def calculate_price(items, discount_rate):
@@ -32,7 +42,7 @@ def calculate_price(items, discount_rate):
     return sum(item.price for item in items)
 """
     
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/workflow/code-review/run",
         json={
             "code": code,
@@ -43,31 +53,35 @@ def calculate_price(items, discount_rate):
     
     if response.status_code == 200:
         result = response.json()
-        print(f"\nRun ID: {result['run_id']}")
-        print(f"Iterations: {result['iterations']}")
-        print(f"\nFinal Quality Score: {result['final_state'].get('quality_score', 'N/A')}")
-        print(f"\nIssues Found: {result['final_state'].get('issue_count', 0)}")
-        print(f"Suggestions: {result['final_state'].get('suggestion_count', 0)}")
+        lines.append(f"\nRun ID: {result['run_id']}")
+        lines.append(f"Iterations: {result['iterations']}")
+        lines.append(f"\nFinal Quality Score: {result['final_state'].get('quality_score', 'N/A')}")
+        lines.append(f"\nIssues Found: {result['final_state'].get('issue_count', 0)}")
+        lines.append(f"Suggestions: {result['final_state'].get('suggestion_count', 0)}")
         
-        print("\n--- Execution Log ---")
+        lines.append("\n--- Execution Log ---")
         for log_entry in result['execution_log']:
-            print(f"[{log_entry['status']}] {log_entry['node_id']}: {log_entry['message']}")
+            lines.append(f"[{log_entry['status']}] {log_entry['node_id']}: {log_entry['message']}")
         
-        print("\n--- Final State ---")
-        print(json.dumps(result['final_state'], indent=2))
+        lines.append("\n--- Final State ---")
+        lines.append(json.dumps(result['final_state'], indent=2))
     else:
-        print(f"Error: {response.status_code}")
-        print(response.text)
+        lines.append(f"Error: {response.status_code}")
+        lines.append(response.text)
+    
+    return "\n".join(lines)
 
 
-def example_custom_graph():
-    """Example: Create and run a custom graph."""
-    print("\n" + "=" * 60)
-    print("Example: Custom Graph")
-    print("=" * 60)
+def example_custom_graph() -> str:
+    """Example: Create and run a custom graph. Returns the text to show."""
+    lines = [
+        "\n" + "=" * 60,
+        "Example: Custom Graph",
+        "=" * 60,
+    ]
     
     # Create a graph
-    create_response = requests.post(
+    create_response = session.post(
         f"{BASE_URL}/graph/create",
         json={
             "name": "Simple Pipeline",
@@ -88,10 +102,10 @@ def example_custom_graph():
     if create_response.status_code == 200:
         graph_data = create_response.json()
         graph_id = graph_data["graph_id"]
-        print(f"Created graph: {graph_id}")
+        lines.append(f"Created graph: {graph_id}")
         
         # Run the graph
-        run_response = requests.post(
+        run_response = session.post(
             f"{BASE_URL}/graph/run",
             json={
                 "graph_id": graph_id,
@@ -104,37 +118,43 @@ def example_custom_graph():
         
         if run_response.status_code == 200:
             result = run_response.json()
-            print(f"\nRun ID: {result['run_id']}")
-            print(f"Final State: {json.dumps(result['final_state'], indent=2)}")
+            lines.append(f"\nRun ID: {result['run_id']}")
+            lines.append(f"Final State: {json.dumps(result['final_state'], indent=2)}")
         else:
-            print(f"Error running graph: {run_response.status_code}")
-            print(run_response.text)
+            lines.append(f"Error running graph: {run_response.status_code}")
+            lines.append(run_response.text)
     else:
-        print(f"Error creating graph: {create_response.status_code}")
-        print(create_response.text)
+        lines.append(f"Error creating graph: {create_response.status_code}")
+        lines.append(create_response.text)
+    
+    return "\n".join(lines)
 
 
-def example_list_resources():
-    """Example: List graphs and tools."""
-    print("\n" + "=" * 60)
-    print("Example: List Resources")
-    print("=" * 60)
+def example_list_resources() -> str:
+    """Example: List graphs and tools. Returns the text to show."""
+    lines = [
+        "\n" + "=" * 60,
+        "Example: List Resources",
+        "=" * 60,
+    ]
     
     # List graphs
-    graphs_response = requests.get(f"{BASE_URL}/graph/list")
+    graphs_response = session.get(f"{BASE_URL}/graph/list")
     if graphs_response.status_code == 200:
         graphs = graphs_response.json()
-        print(f"\nAvailable Graphs: {len(graphs['graphs'])}")
+        lines.append(f"\nAvailable Graphs: {len(graphs['graphs'])}")
         for graph in graphs['graphs']:
-            print(f"  - {graph['name']} ({graph['graph_id']})")
+            lines.append(f"  - {graph['name']} ({graph['graph_id']})")
     
     # List tools
-    tools_response = requests.get(f"{BASE_URL}/tools")
+    tools_response = session.get(f"{BASE_URL}/tools")
     if tools_response.status_code == 200:
         tools = tools_response.json()
-        print(f"\nAvailable Tools: {len(tools['tools'])}")
+        lines.append(f"\nAvailable Tools: {len(tools['tools'])}")
         for tool_name, description in tools['tools'].items():
-            print(f"  - {tool_name}: {description}")
+            lines.append(f"  - {tool_name}: {description}")
+    
+    return "\n".join(lines)
 
 
 if __name__ == "__main__":
@@ -143,13 +163,19 @@ if __name__ == "__main__":
     
     try:
         # Check if server is running
-        response = requests.get(f"{BASE_URL}/")
+        response = session.get(f"{BASE_URL}/")
         if response.status_code == 200:
             print("✓ Server is running\n")
             
-            example_list_resources()
-            example_code_review()
-            example_custom_graph()
+            # These two don't depend on each other, so there's no need to wait for
+            # one to finish before starting the next - we just show their results in order
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                examples = [pool.submit(example_code_review), pool.submit(example_custom_graph)]
+                for example in examples:
+                    print(example.result())
+            
+            # Listed last, so the graph we just created always shows up
+            print(example_list_resources())
         else:
             print("✗ Server is not responding")
     except requests.exceptions.ConnectionError: